@@ -5,7 +5,8 @@ import base64
 try:
     from django.utils.encoding import smart_text
 except ImportError:
-    from django.utils.encoding import smart_unicode as smart_text
+    # Django >= 4.0
+    from django.utils.encoding import smart_str as smart_text
 
 
 from .views import Endpoint
@@ -8,23 +8,76 @@ except ImportError:
     # use packaged django version of simplejson
     from django.utils import simplejson as json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 __all__ = ['JSONResponse', 'JSONErrorResponse', 'HttpError',
     'Http200', 'Http201', 'Http400', 'Http401', 'Http403']
 
 
+def _json_dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+
+
+if orjson is not None:
+    _encoder = DjangoJSONEncoder()
+    _orjson_options = (orjson.OPT_PASSTHROUGH_DATETIME |
+        orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_NON_STR_KEYS)
+
+    def _default(obj):
+        # Subclasses of the builtin types are passed through to us: orjson
+        # would read their builtin storage directly, which is wrong for
+        # classes like django.forms.utils.ErrorList (a UserList whose list
+        # storage is empty).
+        if isinstance(obj, dict):
+            return dict(obj)
+        if isinstance(obj, (list, tuple)):
+            return list(obj)
+        if isinstance(obj, str):
+            return str.__str__(obj)
+        if isinstance(obj, int):
+            return int(obj)
+        if isinstance(obj, float):
+            return float(obj)
+        return _encoder.default(obj)
+
+    def dumps(data):
+        """Serialize data to JSON (as UTF-8 encoded bytes) using orjson.
+
+        Dates and times, as well as any type orjson doesn't support natively,
+        are handled by django.core.serializers.json.DjangoJSONEncoder, so the
+        output matches the one from the json module, except that NaN and
+        infinite floats are emitted as null (the json module writes the
+        invalid JSON tokens NaN and Infinity). Data orjson refuses to encode,
+        such as integers wider than 64 bits, is encoded with the json module.
+        """
+        try:
+            return orjson.dumps(data, default=_default,
+                option=_orjson_options)
+        except orjson.JSONEncodeError:
+            return _json_dumps(data)
+else:
+    def dumps(data):
+        """Serialize data to JSON (as UTF-8 encoded bytes)."""
+        return _json_dumps(data)
+
+
 class JSONResponse(http.HttpResponse):
     """HTTP response with JSON body ("application/json" content type)"""
 
     def __init__(self, data, **kwargs):
         """
         Create a new JSONResponse with the provided data (will be serialized
-        to JSON using django.core.serializers.json.DjangoJSONEncoder).
+        to JSON using orjson if it's installed, falling back to the json
+        module, with django.core.serializers.json.DjangoJSONEncoder handling
+        the types not supported natively).
         """
 
         kwargs['content_type'] = 'application/json; charset=utf-8'
-        super(JSONResponse, self).__init__(json.dumps(data,
-            cls=DjangoJSONEncoder), **kwargs)
+        super(JSONResponse, self).__init__(dumps(data), **kwargs)
 
 
 class JSONErrorResponse(JSONResponse):
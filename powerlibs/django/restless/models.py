@@ -5,7 +5,11 @@ from decimal import Decimal
 from django.core import serializers
 from django.db import models
 
-from django.utils.encoding import force_text
+try:
+    from django.utils.encoding import force_text
+except ImportError:
+    # Django >= 4.0
+    from django.utils.encoding import force_str as force_text
 
 __all__ = ['serialize', 'flatten']
 
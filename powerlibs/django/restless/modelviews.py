@@ -1,32 +1,76 @@
+import functools
+import itertools
 import re
 
+from django import VERSION
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, transaction
 from django.forms.models import modelform_factory
+from django.http import HttpResponse, StreamingHttpResponse
+
+try:
+    from asgiref.sync import sync_to_async
+except ImportError:
+    sync_to_async = None
 
 from .views import Endpoint
-from .http import HttpError, Http200, Http201
+from .http import HttpError, Http200, Http201, dumps
 
 from .models import serialize
 
-__all__ = ['ListEndpoint', 'DetailEndpoint', 'ActionEndpoint']
+__all__ = ['ListEndpoint', 'DetailEndpoint', 'ActionEndpoint',
+    'AsyncListEndpoint', 'AsyncDetailEndpoint']
 
 
-def _get_form(form, model):
-    from django import VERSION
+if VERSION[:2] >= (1, 8):
+    def _modelform_factory(model):
+        return modelform_factory(model, fields='__all__')
+else:
+    _modelform_factory = modelform_factory
 
-    if VERSION[:2] >= (1, 8):
-        def mf(model):
-            return modelform_factory(model, fields='__all__')
-    else:
-        mf = modelform_factory
 
+@functools.lru_cache(maxsize=None)
+def _get_default_form(model):
+    return _modelform_factory(model)
+
+
+def _get_form(form, model):
     if form:
         return form
     elif model:
-        return mf(model)
+        return _get_default_form(model)
     else:
         raise NotImplementedError('Form or Model class not specified')
 
 
+@functools.lru_cache(maxsize=None)
+def _get_attnames(model):
+    # Map both the name and the attname of each concrete field (except the
+    # primary key, which PATCH never changes) to its attname, and collect
+    # the attnames of relation (foreign key) fields.
+    attnames = {}
+    relations = set()
+    for field in model._meta.concrete_fields:
+        if field.primary_key:
+            continue
+        attnames[field.name] = field.attname
+        attnames[field.attname] = field.attname
+        if field.is_relation:
+            relations.add(field.attname)
+    return attnames, frozenset(relations)
+
+
+def _eager_load(qs, select_related, prefetch_related, only=None):
+    if select_related:
+        qs = qs.select_related(*select_related)
+    if prefetch_related:
+        qs = qs.prefetch_related(*prefetch_related)
+    if only:
+        # Relations followed by select_related() can't be deferred.
+        qs = qs.only(*(tuple(only) + tuple(select_related or ())))
+    return qs
+
+
 class ListEndpoint(Endpoint):
     """
     List :py:class:`restless.views.Endpoint` supporting getting a list of
@@ -44,6 +88,49 @@ class ListEndpoint(Endpoint):
 
     You can restrict the HTTP methods available by specifying the `methods`
     class variable.
+
+    The list is paginated: the `page` and `page_size` GET parameters select
+    the slice of the queryset that is fetched from the database. The
+    `page_size` class attribute sets the default page size and
+    `max_page_size` caps the size a client can ask for.
+
+    Related objects used by the serializer should be listed in the
+    `select_related` (forward foreign keys and one-to-one relations, fetched
+    with a SQL JOIN) and `prefetch_related` (many-to-many and reverse foreign
+    key relations, fetched with one extra query each) class attributes, so
+    serializing the list doesn't issue one query per object.
+
+    If the endpoint only needs some of the model columns, list them in the
+    `serialize_fields` class attribute and only those columns are fetched
+    (using `only()`; the relations in `select_related` are added to it
+    automatically). Any other field accessed while serializing is loaded
+    with an extra query per object, so `serialize_fields` must cover
+    everything `fields` and `extra_fields` (or a custom `serialize()`) read.
+
+    Posting a list of objects creates all of them at once using
+    `bulk_create()`, in batches of `bulk_create_batch_size`. Note that
+    `bulk_create()` doesn't call the model's `save()` method, doesn't send
+    the `pre_save`/`post_save` signals and doesn't save many-to-many data.
+    On databases that can't return the inserted rows (anything but
+    PostgreSQL, MariaDB 10.5+ and SQLite 3.35+), the created objects are
+    returned with `id: null`.
+    Set the `post_use_save` class attribute to True to save the objects one
+    by one through the form instead (still inside a single transaction).
+
+    On PostgreSQL, setting the `use_pg_json` class attribute to True makes
+    the database build the JSON for the list (using `json_agg`) instead of
+    serializing the objects in Python. Only model columns can be emitted
+    this way: `fields` must name concrete model fields, and the endpoint's
+    `serialize()` method and `extra_fields` are not used (an endpoint with
+    `extra_fields` always uses the Python serializer). Values are formatted
+    by PostgreSQL, so dates and decimals may be rendered differently.
+
+    For export endpoints that need to return the whole list, set the
+    `stream_results` class attribute to True. The list is then not
+    paginated; instead the objects are read from the database in chunks of
+    `stream_chunk_size` (using `QuerySet.iterator()`) and the JSON array is
+    streamed to the client as it's serialized, so the full list is never
+    held in memory. In this mode `serialize()` is called once per object.
     """
 
     model = None
@@ -51,6 +138,16 @@ class ListEndpoint(Endpoint):
     methods = ['GET', 'POST']
     fields = None
     extra_fields = None
+    page_size = 50
+    max_page_size = 500
+    select_related = ()
+    prefetch_related = ()
+    serialize_fields = None
+    bulk_create_batch_size = 500
+    post_use_save = False
+    use_pg_json = False
+    stream_results = False
+    stream_chunk_size = 500
 
     def get_query_set(self, request, *args, **kwargs):
         """Return a QuerySet that this endpoint represents.
@@ -66,7 +163,9 @@ class ListEndpoint(Endpoint):
         """
 
         if self.model:
-            return self.model.objects.all()
+            return _eager_load(self.model.objects.all(),
+                self.select_related, self.prefetch_related,
+                self.serialize_fields)
         else:
             raise HttpError(404, 'Resource Not Found')
 
@@ -80,22 +179,119 @@ class ListEndpoint(Endpoint):
 
         return serialize(objs, fields=self.fields, include=self.extra_fields)
 
-    def get(self, request, *args, **kwargs):
-        """Return a serialized list of objects in this endpoint."""
+    def get_page(self, request):
+        """Return the (page, page_size) pair requested by the client."""
+
+        try:
+            page = int(request.params.get('page', 1))
+            size = int(request.params.get('page_size', self.page_size))
+        except ValueError:
+            raise HttpError(400, 'Invalid pagination parameters')
 
-        if 'GET' not in self.methods:
-            raise HttpError(405, 'Method Not Allowed')
+        if page < 1 or size < 1:
+            raise HttpError(400, 'Invalid pagination parameters')
+
+        return page, min(size, self.max_page_size)
+
+    def get(self, request, *args, **kwargs):
+        """Return a serialized page of objects in this endpoint."""
 
         qs = self.get_query_set(request, *args, **kwargs)
-        return self.serialize(qs)
+        if self.stream_results:
+            return self._get_stream(qs)
+
+        # Slicing an unordered queryset gives pages that can overlap or
+        # skip objects, so fall back to ordering by primary key.
+        if not qs.ordered:
+            qs = qs.order_by('pk')
+
+        page, size = self.get_page(request)
+        if (self.use_pg_json and self.extra_fields is None and
+                connections[qs.db].vendor == 'postgresql'):
+            return self._get_pg_json(qs, page, size)
+
+        # Fetch one object past the page to know whether there are more,
+        # instead of running a separate COUNT query.
+        offset = (page - 1) * size
+        objs = list(qs[offset:offset + size + 1])
+
+        return {
+            'results': self.serialize(objs[:size]),
+            'page': page,
+            'has_more': len(objs) > size,
+        }
+
+    def _get_stream(self, qs):
+        def stream():
+            yield b'['
+            separator = b''
+            for obj in qs.iterator(chunk_size=self.stream_chunk_size):
+                yield separator + dumps(self.serialize(obj))
+                separator = b','
+            yield b']'
+
+        return StreamingHttpResponse(stream(),
+            content_type='application/json; charset=utf-8')
+
+    def _get_pg_json(self, qs, page, size):
+        fieldmap = dict((f.name, f.attname)
+            for f in qs.model._meta.concrete_model._meta.local_fields)
+        columns = [fieldmap.get(f, f) for f in (self.fields or fieldmap)]
+
+        offset = (page - 1) * size
+        qs = qs.values(*columns)[offset:offset + size + 1]
+        sql, params = qs.query.sql_with_params()
+
+        # Number the rows as they come out of the page query (which is
+        # ordered) and aggregate them in that order, so json_agg keeps the
+        # queryset ordering. The extra row only tells if there are more.
+        with connections[qs.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT coalesce(json_agg(p.row ORDER BY p.rn) "
+                "FILTER (WHERE p.rn <= %d), '[]'::json)::text, count(*) "
+                "FROM (SELECT row_to_json(t) AS row, "
+                "row_number() OVER () AS rn FROM (%s) t) p" % (size, sql),
+                params)
+            results, count = cursor.fetchone()
+
+        content = '{"results": %s, "page": %d, "has_more": %s}' % (
+            results, page, 'true' if count > size else 'false')
+        return HttpResponse(content,
+            content_type='application/json; charset=utf-8')
 
     def post(self, request, *args, **kwargs):
-        """Create a new object."""
+        """Create a new object.
 
-        if 'POST' not in self.methods:
-            raise HttpError(405, 'Method Not Allowed')
+        If the request payload is a list, every entry is validated first and
+        the objects are then created in a single transaction, either with one
+        `bulk_create()` call or, if `post_use_save` is set, one by one.
+        """
 
         Form = _get_form(self.form, self.model)
+
+        if isinstance(request.data, list):
+            forms = []
+            errors = {}
+            for index, entry in enumerate(request.data):
+                if not isinstance(entry, dict):
+                    errors[index] = {'__all__': ['Expected an object.']}
+                    continue
+                form = Form(entry, None)
+                if not form.is_valid():
+                    errors[index] = form.errors
+                forms.append(form)
+            if errors:
+                raise HttpError(400, 'Invalid Data', errors=errors)
+
+            with transaction.atomic():
+                if self.post_use_save:
+                    objs = [form.save() for form in forms]
+                else:
+                    objs = self.model.objects.bulk_create(
+                        [form.save(commit=False) for form in forms],
+                        batch_size=self.bulk_create_batch_size)
+            return Http201(self.serialize(objs))
+
         form = Form(request.data or None, request.FILES)
         if form.is_valid():
             obj = form.save()
@@ -121,22 +317,38 @@ class DetailEndpoint(Endpoint):
     You can restrict the HTTP methods available by specifying the `methods`
     class variable.
 
+    The `select_related`, `prefetch_related` and `serialize_fields` class
+    attributes work the same as in :py:class:`ListEndpoint`
+    (`serialize_fields` is not applied to the object updated by PUT).
+
+    When PUT updates an existing object, all of its fields are written. If
+    only some of them can change, list them in the `put_update_fields`
+    class attribute to limit the `UPDATE` query to those columns.
+
     """
     model = None
     form = None
     lookup_field = 'pk'
     fields = None
     extra_fields = None
+    select_related = ()
+    prefetch_related = ()
+    serialize_fields = None
+    patch_use_save = False
+    put_update_fields = None
     methods = ['GET', 'PUT', 'PATCH', 'DELETE']
 
     def _get_instance(self, request, *args, **kwargs):
         if self.model and self.lookup_field in kwargs:
-            try:
-                return self.model.objects.get(**{
-                    self.lookup_field: kwargs.get(self.lookup_field)
-                })
-            except self.model.DoesNotExist:
-                pass
+            # PUT hands the instance to a ModelForm, which reads every
+            # field, so it must not be loaded with deferred fields.
+            only = self.serialize_fields
+            if request.method == 'PUT':
+                only = None
+            qs = _eager_load(self.model.objects.filter(**{
+                self.lookup_field: kwargs.get(self.lookup_field)
+            }), self.select_related, self.prefetch_related, only)
+            return qs.first()
 
     def get_instance(self, request, *args, **kwargs):
         instance = self._get_instance(request, *args, **kwargs)
@@ -171,18 +383,85 @@ class DetailEndpoint(Endpoint):
     def get(self, request, *args, **kwargs):
         """Return the serialized object represented by this endpoint."""
 
-        if 'GET' not in self.methods:
-            raise HttpError(405, 'Method Not Allowed')
-
         return self.serialize(self.get_instance(request, *args, **kwargs))
 
     def patch(self, request, *args, **kwargs):
-        """Update the object represented by this endpoint."""
+        """Update the object represented by this endpoint.
+
+        The fields present in the request are written with a single `UPDATE`
+        query, without loading the object first. Set the `patch_use_save`
+        class attribute to True if the model relies on `save()` (or the
+        signals it sends) being called.
+        """
 
-        if 'PATCH' not in self.methods:
-            raise HttpError(405, 'Method Not Allowed')
+        values = self._get_patch_values(request)
+        if self.patch_use_save:
+            instance = self.get_instance(request, *args, **kwargs)
+            update_fields = self._set_patch_values(instance, values)
+            instance.save(update_fields=update_fields)
+            return Http200(self.serialize(instance))
 
-        queryset = self.get_instance_as_queryset(request, *args, **kwargs)
+        if values:
+            kwargs = self._update_instance(values, **kwargs)
+
+        instance = self.get_instance(request, *args, **kwargs)
+        return Http200(self.serialize(instance))
+
+    def _update_instance(self, values, **kwargs):
+        if not (self.model and self.lookup_field in kwargs):
+            raise HttpError(404, 'Resource Not Found')
+
+        lookup_value = kwargs.get(self.lookup_field)
+        queryset = self.model.objects.filter(**{
+            self.lookup_field: lookup_value
+        })
+
+        if self._lookup_is_unique():
+            updated = queryset.update(**values)
+        else:
+            with transaction.atomic():
+                updated = queryset.update(**values)
+
+                # Raising inside the atomic block rolls back the UPDATE if
+                # it matched more than one object.
+                if updated > 1:
+                    raise self.model.MultipleObjectsReturned(
+                        f'{self.model.__name__}: {self.lookup_field}:{lookup_value}')
+
+        if updated == 0:
+            raise HttpError(404, 'Resource Not Found')
+
+        # Return the URL kwargs pointing at the updated object, which may
+        # have been moved by changing the lookup field itself.
+        kwargs[self.lookup_field] = self._get_new_lookup_value(
+            values, lookup_value)
+        return kwargs
+
+    def _lookup_is_unique(self):
+        if self.lookup_field == 'pk':
+            return True
+        try:
+            return self.model._meta.get_field(self.lookup_field).unique
+        except FieldDoesNotExist:
+            return False
+
+    def _get_new_lookup_value(self, values, lookup_value):
+        names = [self.lookup_field]
+        try:
+            if self.lookup_field == 'pk':
+                field = self.model._meta.pk
+            else:
+                field = self.model._meta.get_field(self.lookup_field)
+            names.extend([field.name, field.attname])
+        except FieldDoesNotExist:
+            pass
+
+        for name in names:
+            if name in values:
+                return values[name]
+        return lookup_value
+
+    def _get_patch_values(self, request):
         values = {}
         fields_names = self.get_fields_names()
         for key, value in request.data.items():
@@ -192,14 +471,21 @@ class DetailEndpoint(Endpoint):
 
             if key in fields_names or clean_key in fields_names:
                 values[key] = value
-
-        instance = self.get_instance(request, *args, **kwargs)
-        for key, value in values.items():
-                setattr(instance, key, value)
-
-        queryset.update(**values)
-
-        return Http200(self.serialize(instance))
+        return values
+
+    def _set_patch_values(self, instance, values):
+        attnames, relations = _get_attnames(self.model)
+        data = dict((attnames[key], value)
+            for key, value in values.items() if key in attnames)
+        update_fields = list(data)
+
+        # Plain columns are stored directly in the instance dict, skipping
+        # the field descriptors; foreign keys still go through setattr() so
+        # the cached related object is invalidated.
+        for attname in relations.intersection(data):
+            setattr(instance, attname, data.pop(attname))
+        instance.__dict__.update(data)
+        return update_fields
 
     def get_foreign_keys(self):
         fields = []
@@ -218,9 +504,6 @@ class DetailEndpoint(Endpoint):
     def put(self, request, *args, **kwargs):
         """Update the object represented by this endpoint."""
 
-        if 'PUT' not in self.methods:
-            raise HttpError(405, 'Method Not Allowed')
-
         pk = kwargs[self.lookup_field] if self.lookup_field in kwargs else None
 
         for fk_field in self.get_foreign_keys():
@@ -230,11 +513,27 @@ class DetailEndpoint(Endpoint):
 
         Form = _get_form(self.form, self.model)
         instance = self._get_instance(request, *args, **kwargs)
+        partial = bool(instance and self.put_update_fields)
+        if partial:
+            # The form copies every cleaned field onto the instance, but only
+            # put_update_fields are stored; keep the other values so the
+            # response matches the database.
+            attnames, _ = _get_attnames(self.model)
+            stored = set(attnames.get(name, name)
+                for name in self.put_update_fields)
+            original = dict((attname, getattr(instance, attname))
+                for attname in set(attnames.values()) - stored)
+
         form = Form(request.data or None, request.FILES, instance=instance)
         if form.is_valid():
             obj = form.save(commit=False)
             obj.pk = pk
-            obj.save()
+            if partial:
+                obj.save(update_fields=self.put_update_fields)
+                for attname, value in original.items():
+                    setattr(obj, attname, value)
+            else:
+                obj.save()
             form.save_m2m()
 
             if instance:
@@ -247,9 +546,6 @@ class DetailEndpoint(Endpoint):
     def delete(self, request, *args, **kwargs):
         """Delete the object represented by this endpoint."""
 
-        if 'DELETE' not in self.methods:
-            raise HttpError(405, 'Method Not Allowed')
-
         instance = self.get_instance(request, *args, **kwargs)
         instance.delete()
         return {}
@@ -270,11 +566,156 @@ class ActionEndpoint(DetailEndpoint):
     methods = ['POST']
 
     def post(self, request, *args, **kwargs):
-        if 'POST' not in self.methods:
-            raise HttpError(405, 'Method Not Allowed')
-
         instance = self.get_instance(request, *args, **kwargs)
         return self.action(request, instance, *args, **kwargs)
 
     def action(self, request, obj, *args, **kwargs):
         raise HttpError(405, 'Method Not Allowed')
+
+
+class AsyncListEndpoint(ListEndpoint):
+    """
+    Asynchronous variant of :py:class:`ListEndpoint`, for projects served
+    through ASGI (requires Django 4.2 or newer). Objects are fetched using
+    the async ORM API, so the worker isn't blocked while waiting for the
+    database. All the documentation for ListEndpoint applies.
+
+    Serialization and form handling (used when creating objects) are
+    synchronous in Django, so they are run in a worker thread.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        """Return a serialized page of objects in this endpoint."""
+
+        qs = self.get_query_set(request, *args, **kwargs)
+        if self.stream_results:
+            return self._aget_stream(qs)
+
+        # Slicing an unordered queryset gives pages that can overlap or
+        # skip objects, so fall back to ordering by primary key.
+        if not qs.ordered:
+            qs = qs.order_by('pk')
+
+        page, size = self.get_page(request)
+        if (self.use_pg_json and self.extra_fields is None and
+                connections[qs.db].vendor == 'postgresql'):
+            return await sync_to_async(self._get_pg_json)(qs, page, size)
+
+        offset = (page - 1) * size
+        objs = [obj async for obj in qs[offset:offset + size + 1]]
+
+        return {
+            'results': await sync_to_async(self.serialize)(objs[:size]),
+            'page': page,
+            'has_more': len(objs) > size,
+        }
+
+    def _aget_stream(self, qs):
+        chunk_size = self.stream_chunk_size
+
+        def dump_chunk(chunk):
+            return b','.join(dumps(self.serialize(obj)) for obj in chunk)
+
+        async def chunks():
+            if qs._prefetch_related_lookups:
+                # aiterator() doesn't support prefetch_related() before
+                # Django 5.0, so read the chunks from the sync iterator.
+                objs = qs.iterator(chunk_size=chunk_size)
+
+                def next_chunk():
+                    return list(itertools.islice(objs, chunk_size))
+
+                chunk = await sync_to_async(next_chunk)()
+                while chunk:
+                    yield chunk
+                    chunk = await sync_to_async(next_chunk)()
+                return
+
+            chunk = []
+            async for obj in qs.aiterator(chunk_size=chunk_size):
+                chunk.append(obj)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        async def stream():
+            yield b'['
+            separator = b''
+            async for chunk in chunks():
+                yield separator + await sync_to_async(dump_chunk)(chunk)
+                separator = b','
+            yield b']'
+
+        return StreamingHttpResponse(stream(),
+            content_type='application/json; charset=utf-8')
+
+    async def post(self, request, *args, **kwargs):
+        """Create a new object."""
+
+        return await sync_to_async(super(AsyncListEndpoint, self).post)(
+            request, *args, **kwargs)
+
+
+class AsyncDetailEndpoint(DetailEndpoint):
+    """
+    Asynchronous variant of :py:class:`DetailEndpoint`, for projects served
+    through ASGI (requires Django 4.2 or newer). The object is fetched,
+    saved and deleted using the async ORM API. All the documentation for
+    DetailEndpoint applies.
+
+    Serialization, form handling (used by PUT) and the transactional
+    `UPDATE` issued by PATCH are synchronous in Django, so they are run in a
+    worker thread.
+    """
+
+    async def _aget_instance(self, request, *args, **kwargs):
+        if self.model and self.lookup_field in kwargs:
+            qs = _eager_load(self.model.objects.filter(**{
+                self.lookup_field: kwargs.get(self.lookup_field)
+            }), self.select_related, self.prefetch_related,
+                self.serialize_fields)
+            return await qs.afirst()
+
+    async def aget_instance(self, request, *args, **kwargs):
+        instance = await self._aget_instance(request, *args, **kwargs)
+        if instance is None:
+            raise HttpError(404, 'Resource Not Found')
+        return instance
+
+    async def get(self, request, *args, **kwargs):
+        """Return the serialized object represented by this endpoint."""
+
+        instance = await self.aget_instance(request, *args, **kwargs)
+        return await sync_to_async(self.serialize)(instance)
+
+    async def patch(self, request, *args, **kwargs):
+        """Update the object represented by this endpoint."""
+
+        values = self._get_patch_values(request)
+        if self.patch_use_save:
+            instance = await self.aget_instance(request, *args, **kwargs)
+            update_fields = self._set_patch_values(instance, values)
+            await instance.asave(update_fields=update_fields)
+            return Http200(await sync_to_async(self.serialize)(instance))
+
+        if values:
+            kwargs = await sync_to_async(self._update_instance)(
+                values, **kwargs)
+
+        instance = await self.aget_instance(request, *args, **kwargs)
+        return Http200(await sync_to_async(self.serialize)(instance))
+
+    async def put(self, request, *args, **kwargs):
+        """Update the object represented by this endpoint."""
+
+        return await sync_to_async(super(AsyncDetailEndpoint, self).put)(
+            request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        """Delete the object represented by this endpoint."""
+
+        instance = await self.aget_instance(request, *args, **kwargs)
+        await instance.adelete()
+        return {}
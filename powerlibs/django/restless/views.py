@@ -6,6 +6,12 @@ from django.conf import settings
 from django.http import HttpResponse, StreamingHttpResponse
 from .http import Http200, Http500, HttpError
 
+try:
+    from asgiref.sync import sync_to_async
+except ImportError:
+    sync_to_async = None
+
+import asyncio
 import traceback
 import json
 
@@ -19,6 +25,10 @@ class Endpoint(View):
     implement the corresponding get(), post(), put(), head() or delete()
     method, respectively.
 
+    The HTTP methods the endpoint responds to can be restricted by listing
+    them in the `methods` class attribute; requests using any other method
+    get a HTTP 405 (Method Not Allowed) response.
+
     If you also implement authenticate(request) method, it will be called
     before the main method to provide authentication, if needed. Auth mixins
     use this to provide authentication.
@@ -47,6 +57,50 @@ class Endpoint(View):
     immediately return the error to the client.
     """
 
+    _handlers = {}
+    _view_is_async = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._handlers = cls._get_handlers(getattr(cls, 'methods', None))
+
+    def __init__(self, **kwargs):
+        super(Endpoint, self).__init__(**kwargs)
+        if 'methods' in kwargs:
+            self._handlers = self._get_handlers(kwargs['methods'])
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super(Endpoint, cls).as_view(**initkwargs)
+        # View.view_is_async inspects every handler each time it's read, so
+        # evaluate it once here, after any class decorators were applied.
+        cls._view_is_async = getattr(cls, 'view_is_async', False)
+        return view
+
+    @classmethod
+    def _get_handlers(cls, methods):
+        # Map each allowed HTTP verb to the name of the method handling it.
+        # The method itself is looked up on each request, so decorators
+        # applied to the class (e.g. with method_decorator) are honoured.
+        # OPTIONS is always answered, and HEAD falls back to GET as in
+        # Django's View.
+        allowed_verbs = None
+        if methods is not None:
+            allowed_verbs = frozenset(method.upper() for method in methods)
+
+        handlers = {}
+        for method in cls.http_method_names:
+            if not hasattr(cls, method):
+                continue
+            verb = method.upper()
+            if (allowed_verbs is None or verb in allowed_verbs or
+                    verb == 'OPTIONS'):
+                handlers[verb] = method
+
+        if 'HEAD' not in handlers and 'GET' in handlers:
+            handlers['HEAD'] = handlers['GET']
+        return handlers
+
     @staticmethod
     def _parse_content_type(content_type):
         if ';' in content_type:
@@ -90,29 +144,73 @@ class Endpoint(View):
                 raise TypeError('authenticate method must return '
                     'HttpResponse instance or None')
 
-    @method_decorator(csrf_exempt)
-    def dispatch(self, request, *args, **kwargs):
+    def _method_not_allowed(self):
+        err = HttpError(405, 'Method Not Allowed')
+        err.response['Allow'] = ', '.join(self._handlers)
+        return err
+
+    def _prepare_request(self, request):
         if not hasattr(request, 'content_type'):
             request.content_type = request.META.get('CONTENT_TYPE', 'text/plain')
         request.params = dict((k, v) for (k, v) in request.GET.items())
         request.data = None
         request.raw_data = request.body
 
+        self._parse_body(request)
+        return self._process_authenticate(request)
+
+    def _process_error(self, ex):
+        if isinstance(ex, HttpError):
+            return ex.response
+        if settings.DEBUG:
+            return Http500(str(ex), traceback=traceback.format_exc())
+        raise ex
+
+    @staticmethod
+    def _process_response(response):
+        if isinstance(response, (HttpResponse, StreamingHttpResponse)):
+            return response
+        return Http200(response)
+
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        handler = self._handlers.get(request.method)
+        if handler is not None:
+            handler = getattr(self, handler)
+        # as_view() marks views with async handlers as coroutine functions,
+        # so every request to them (including OPTIONS and disallowed
+        # methods) must be answered with an awaitable.
+        if self._view_is_async:
+            return self._async_dispatch(handler, request, *args, **kwargs)
+
         try:
-            self._parse_body(request)
-            authentication_required = self._process_authenticate(request)
+            authentication_required = self._prepare_request(request)
             if authentication_required:
                 return authentication_required
 
-            response = super(Endpoint, self).dispatch(request, *args, **kwargs)
-        except HttpError as err:
-            response = err.response
+            if handler is None:
+                raise self._method_not_allowed()
+            response = handler(request, *args, **kwargs)
         except Exception as ex:
-            if settings.DEBUG:
-                response = Http500(str(ex), traceback=traceback.format_exc())
-            else:
-                raise
+            response = self._process_error(ex)
 
-        if isinstance(response, (HttpResponse, StreamingHttpResponse)):
-            return response
-        return Http200(response)
+        return self._process_response(response)
+
+    async def _async_dispatch(self, handler, request, *args, **kwargs):
+        # Body parsing and authentication may hit the database, so they
+        # run in a worker thread; only the handler itself is awaited.
+        try:
+            authentication_required = await sync_to_async(
+                self._prepare_request)(request)
+            if authentication_required:
+                return authentication_required
+
+            if handler is None:
+                raise self._method_not_allowed()
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as ex:
+            response = self._process_error(ex)
+
+        return self._process_response(response)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+import sys
+
+import django
+from django.conf import settings
+from django.test.utils import get_runner
+
+
+settings.configure(
+    DEBUG=False,
+    INSTALLED_APPS=[
+        'django.contrib.contenttypes',
+        'django.contrib.auth',
+        'tests',
+    ],
+    DATABASES={
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        },
+    },
+    DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+)
+
+
+if __name__ == '__main__':
+    django.setup()
+    TestRunner = get_runner(settings)
+    failures = TestRunner().run_tests(sys.argv[1:] or ['tests'])
+    sys.exit(bool(failures))
@@ -3,7 +3,7 @@ try:
 except ImportError:
     from distutils.core import setup
 
-version = '0.6.9'
+version = '0.7.0'
 
 with open('requirements/production.txt') as requirements_file:
     requires = [item for item in requirements_file]
@@ -27,6 +27,7 @@ setup(
     package_data={'': ['AUTHORS.md', 'README.md']},
     include_package_data=True,
     install_requires=requires,
+    extras_require={'orjson': ['orjson>=3.6']},
     zip_safe=False,
     keywords='generic libraries',
     classifiers=(
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class Owner(models.Model):
+    name = models.CharField(max_length=50)
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+
+
+class Thing(models.Model):
+    name = models.CharField(max_length=50)
+    code = models.CharField(max_length=10, default='', blank=True)
+    price = models.DecimalField(max_digits=6, decimal_places=2, null=True,
+        blank=True)
+    owner = models.ForeignKey(Owner, null=True, blank=True,
+        on_delete=models.CASCADE)
+    tags = models.ManyToManyField(Tag, blank=True)
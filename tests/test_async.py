@@ -0,0 +1,75 @@
+import json
+
+from django.test import AsyncRequestFactory, TestCase
+
+from powerlibs.django.restless.modelviews import (AsyncListEndpoint,
+    AsyncDetailEndpoint)
+
+from .models import Thing
+
+
+class AsyncThingList(AsyncListEndpoint):
+    model = Thing
+    page_size = 2
+
+
+class AsyncThingExport(AsyncListEndpoint):
+    model = Thing
+    stream_results = True
+    stream_chunk_size = 2
+
+
+class AsyncThingDetail(AsyncDetailEndpoint):
+    model = Thing
+
+
+class AsyncEndpointTest(TestCase):
+    factory = AsyncRequestFactory()
+
+    def setUp(self):
+        for i in range(3):
+            Thing.objects.create(name='thing %d' % i)
+
+    async def call(self, endpoint, method, data=None, **kwargs):
+        body = json.dumps(data) if data is not None else ''
+        request = self.factory.generic(method, '/', body,
+            content_type='application/json')
+        return await endpoint.as_view()(request, **kwargs)
+
+    async def test_get_list(self):
+        response = await self.call(AsyncThingList, 'GET')
+        data = json.loads(response.content)
+        self.assertEqual(len(data['results']), 2)
+        self.assertTrue(data['has_more'])
+
+    async def test_method_not_allowed(self):
+        response = await self.call(AsyncThingList, 'DELETE')
+        self.assertEqual(response.status_code, 405)
+        self.assertIn('GET', response['Allow'])
+
+    async def test_options(self):
+        response = await self.call(AsyncThingList, 'OPTIONS')
+        self.assertEqual(response.status_code, 200)
+
+    async def test_patch(self):
+        thing = await Thing.objects.afirst()
+        response = await self.call(AsyncThingDetail, 'PATCH',
+            data={'name': 'async'}, pk=thing.pk)
+        self.assertEqual(json.loads(response.content)['name'], 'async')
+
+    async def stream(self, endpoint):
+        response = await self.call(endpoint, 'GET')
+        content = b''.join([part async for part in response.streaming_content])
+        return json.loads(content)
+
+    async def test_stream(self):
+        data = await self.stream(AsyncThingExport)
+        self.assertEqual([t['name'] for t in data],
+            ['thing 0', 'thing 1', 'thing 2'])
+
+    async def test_stream_with_prefetch_related(self):
+        class PrefetchingExport(AsyncThingExport):
+            prefetch_related = ('tags',)
+
+        data = await self.stream(PrefetchingExport)
+        self.assertEqual(len(data), 3)
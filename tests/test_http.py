@@ -0,0 +1,16 @@
+import json
+
+from django.forms.utils import ErrorList
+from django.test import SimpleTestCase
+
+from powerlibs.django.restless.http import dumps
+
+
+class DumpsTest(SimpleTestCase):
+    def test_error_list(self):
+        data = {'name': ErrorList(['This field is required.'])}
+        self.assertEqual(json.loads(dumps(data)),
+            {'name': ['This field is required.']})
+
+    def test_integer_wider_than_64_bits(self):
+        self.assertEqual(json.loads(dumps({'n': 2 ** 70})), {'n': 2 ** 70})
@@ -0,0 +1,189 @@
+from django.test import TestCase
+
+from powerlibs.django.restless.modelviews import ListEndpoint, DetailEndpoint
+
+from .models import Thing
+from .utils import EndpointTestMixin
+
+
+class ThingList(ListEndpoint):
+    model = Thing
+    page_size = 2
+
+
+class ThingDetail(DetailEndpoint):
+    model = Thing
+
+
+class ListEndpointTest(EndpointTestMixin, TestCase):
+    def setUp(self):
+        for i in range(5):
+            Thing.objects.create(name='thing %d' % i)
+
+    def test_first_page(self):
+        data = self.payload(self.call(ThingList, 'GET'))
+        self.assertEqual([t['name'] for t in data['results']],
+            ['thing 0', 'thing 1'])
+        self.assertEqual(data['page'], 1)
+        self.assertTrue(data['has_more'])
+
+    def test_last_page(self):
+        data = self.payload(self.call(ThingList, 'GET', '/?page=3'))
+        self.assertEqual([t['name'] for t in data['results']], ['thing 4'])
+        self.assertFalse(data['has_more'])
+
+    def test_full_last_page_has_no_more(self):
+        data = self.payload(self.call(ThingList, 'GET', '/?page_size=5'))
+        self.assertEqual(len(data['results']), 5)
+        self.assertFalse(data['has_more'])
+
+    def test_page_size_is_capped(self):
+        class CappedList(ThingList):
+            max_page_size = 3
+
+        data = self.payload(self.call(CappedList, 'GET', '/?page_size=100'))
+        self.assertEqual(len(data['results']), 3)
+
+    def test_invalid_page(self):
+        response = self.call(ThingList, 'GET', '/?page=zero')
+        self.assertEqual(response.status_code, 400)
+
+    def test_unordered_queryset_is_ordered_by_pk(self):
+        with self.assertNumQueries(1) as ctx:
+            self.call(ThingList, 'GET')
+        self.assertIn('ORDER BY', ctx.captured_queries[0]['sql'])
+
+    def test_post(self):
+        response = self.call(ThingList, 'POST', data={'name': 'new'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.payload(response)['name'], 'new')
+        self.assertTrue(Thing.objects.filter(name='new').exists())
+
+    def test_post_list(self):
+        response = self.call(ThingList, 'POST',
+            data=[{'name': 'a'}, {'name': 'b'}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([t['name'] for t in self.payload(response)],
+            ['a', 'b'])
+        self.assertEqual(Thing.objects.filter(name__in=['a', 'b']).count(), 2)
+
+    def test_post_list_with_invalid_entry(self):
+        response = self.call(ThingList, 'POST',
+            data=[{'name': 'a'}, {'price': 'x'}])
+        self.assertEqual(response.status_code, 400)
+        errors = self.payload(response)['errors']
+        self.assertEqual(list(errors), ['1'])
+        self.assertEqual(errors['1']['name'], ['This field is required.'])
+        self.assertFalse(Thing.objects.filter(name='a').exists())
+
+    def test_post_list_with_non_object_entries(self):
+        response = self.call(ThingList, 'POST',
+            data=[{'name': 'a'}, 1, 'x'])
+        self.assertEqual(response.status_code, 400)
+        errors = self.payload(response)['errors']
+        self.assertEqual(sorted(errors), ['1', '2'])
+        self.assertEqual(errors['1'], {'__all__': ['Expected an object.']})
+        self.assertFalse(Thing.objects.filter(name='a').exists())
+
+    def test_delete_is_not_allowed(self):
+        response = self.call(ThingList, 'DELETE')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET, POST, OPTIONS, HEAD')
+
+
+class DetailEndpointTest(EndpointTestMixin, TestCase):
+    def setUp(self):
+        self.thing = Thing.objects.create(name='thing', code='a')
+
+    def test_get(self):
+        response = self.call(ThingDetail, 'GET', pk=self.thing.pk)
+        self.assertEqual(self.payload(response)['name'], 'thing')
+
+    def test_get_missing(self):
+        response = self.call(ThingDetail, 'GET', pk=self.thing.pk + 1)
+        self.assertEqual(response.status_code, 404)
+
+    def test_patch(self):
+        response = self.call(ThingDetail, 'PATCH',
+            data={'name': 'renamed', 'unknown': 1}, pk=self.thing.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.payload(response)['name'], 'renamed')
+        self.thing.refresh_from_db()
+        self.assertEqual(self.thing.name, 'renamed')
+
+    def test_patch_by_pk_is_a_single_update(self):
+        with self.assertNumQueries(2) as ctx:
+            self.call(ThingDetail, 'PATCH', data={'name': 'x'},
+                pk=self.thing.pk)
+        self.assertTrue(ctx.captured_queries[0]['sql'].startswith('UPDATE'))
+
+    def test_patch_missing(self):
+        response = self.call(ThingDetail, 'PATCH', data={'name': 'x'},
+            pk=self.thing.pk + 1)
+        self.assertEqual(response.status_code, 404)
+
+    def test_patch_with_save(self):
+        class SavingDetail(ThingDetail):
+            patch_use_save = True
+
+        response = self.call(SavingDetail, 'PATCH',
+            data={'id': self.thing.pk, 'name': 'saved'}, pk=self.thing.pk)
+        self.assertEqual(response.status_code, 200)
+        self.thing.refresh_from_db()
+        self.assertEqual(self.thing.name, 'saved')
+
+    def test_patch_non_unique_lookup_is_rolled_back(self):
+        Thing.objects.create(name='other', code='a')
+
+        class CodeDetail(ThingDetail):
+            lookup_field = 'code'
+
+        with self.assertRaises(Thing.MultipleObjectsReturned):
+            self.call(CodeDetail, 'PATCH', data={'name': 'x'}, code='a')
+        self.assertFalse(Thing.objects.filter(name='x').exists())
+
+    def test_patch_lookup_field(self):
+        class CodeDetail(ThingDetail):
+            lookup_field = 'code'
+
+        response = self.call(CodeDetail, 'PATCH', data={'code': 'b'},
+            code='a')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.payload(response)['code'], 'b')
+
+    def test_patch_primary_key(self):
+        response = self.call(ThingDetail, 'PATCH',
+            data={'id': self.thing.pk + 10}, pk=self.thing.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.payload(response)['id'], self.thing.pk + 10)
+
+    def test_put(self):
+        response = self.call(ThingDetail, 'PUT',
+            data={'name': 'put', 'price': '9'}, pk=self.thing.pk)
+        self.assertEqual(response.status_code, 200)
+        self.thing.refresh_from_db()
+        self.assertEqual(self.thing.name, 'put')
+        self.assertEqual(self.thing.price, 9)
+
+    def test_put_update_fields(self):
+        class PartialDetail(ThingDetail):
+            put_update_fields = ['name']
+
+        response = self.call(PartialDetail, 'PUT',
+            data={'name': 'put', 'price': '9'}, pk=self.thing.pk)
+        self.assertEqual(response.status_code, 200)
+        data = self.payload(response)
+        self.assertEqual(data['name'], 'put')
+        self.assertIsNone(data['price'])
+        self.thing.refresh_from_db()
+        self.assertEqual(self.thing.name, 'put')
+        self.assertIsNone(self.thing.price)
+
+    def test_delete(self):
+        response = self.call(ThingDetail, 'DELETE', pk=self.thing.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Thing.objects.exists())
+
+    def test_post_is_not_allowed(self):
+        response = self.call(ThingDetail, 'POST', pk=self.thing.pk)
+        self.assertEqual(response.status_code, 405)
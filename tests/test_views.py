@@ -0,0 +1,63 @@
+from django.http import HttpResponseForbidden
+from django.test import SimpleTestCase
+from django.utils.decorators import method_decorator
+
+from powerlibs.django.restless.views import Endpoint
+
+from .utils import EndpointTestMixin
+
+
+class HelloEndpoint(Endpoint):
+    def get(self, request):
+        return {'message': 'hello'}
+
+
+class GetOnlyEndpoint(Endpoint):
+    methods = ['GET']
+
+    def get(self, request):
+        return {'message': 'hello'}
+
+    def post(self, request):
+        return {'message': 'created'}
+
+
+class EndpointTest(EndpointTestMixin, SimpleTestCase):
+    def test_returns_json(self):
+        response = self.call(HelloEndpoint, 'GET')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.payload(response), {'message': 'hello'})
+
+    def test_unimplemented_method_is_not_allowed(self):
+        response = self.call(HelloEndpoint, 'DELETE')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET, OPTIONS, HEAD')
+
+    def test_method_not_in_methods_is_not_allowed(self):
+        response = self.call(GetOnlyEndpoint, 'POST')
+        self.assertEqual(response.status_code, 405)
+        self.assertNotIn('POST', response['Allow'])
+
+    def test_head_falls_back_to_get(self):
+        response = self.call(GetOnlyEndpoint, 'HEAD')
+        self.assertEqual(response.status_code, 200)
+
+
+def _forbid(view_func):
+    def wrapper(request, *args, **kwargs):
+        return HttpResponseForbidden()
+    return wrapper
+
+
+@method_decorator(_forbid, name='get')
+class DecoratedEndpoint(Endpoint):
+    methods = ['GET']
+
+    def get(self, request):
+        return {'message': 'secret'}
+
+
+class DecoratedEndpointTest(EndpointTestMixin, SimpleTestCase):
+    def test_class_level_method_decorator_is_applied(self):
+        response = self.call(DecoratedEndpoint, 'GET')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,17 @@
+import json
+
+from django.test import RequestFactory
+
+
+class EndpointTestMixin(object):
+    factory = RequestFactory()
+
+    def call(self, endpoint, method, path='/', data=None, **kwargs):
+        body = json.dumps(data) if data is not None else ''
+        request = self.factory.generic(method, path, body,
+            content_type='application/json')
+        return endpoint.as_view()(request, **kwargs)
+
+    @staticmethod
+    def payload(response):
+        return json.loads(response.content.decode('utf-8'))